@@ -1,74 +1,90 @@
-import requests
+import asyncio
+import httpx
 import sys
 import json
-from datetime import datetime
 import uuid
 
+# Field sets for structure validation, hoisted so the per-item checks are
+# C-level set differences instead of nested Python loops
+LESSON_REQUIRED_FIELDS = frozenset({'id', 'title', 'content', 'order'})
+VIDEO_REQUIRED_FIELDS = frozenset({'video_id', 'title', 'channel_name'})
+
+
 class AILearningPlatformTester:
-    def __init__(self, base_url="https://smarttutor-5.preview.emergentagent.com/api"):
+    def __init__(self, base_url="https://smarttutor-5.preview.emergentagent.com/api", verbose=True):
         self.base_url = base_url
+        self.verbose = verbose
         self.tests_run = 0
         self.tests_passed = 0
         self.course_data = None
         self.lesson_id = None
         self.session_token = None
         self.user_data = None
-        self.session = requests.Session()  # Use session for cookie management
+        # Pooled client with cookie management; HTTP/2 multiplexes the
+        # concurrent probes over one TLS connection (needs httpx[http2])
+        self.client = httpx.AsyncClient(http2=True, timeout=30)
+        self._base_headers = {'Content-Type': 'application/json'}  # Built once, shared by every test
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, timeout=30, auth_required=False):
+    async def run_test(self, name, method, endpoint, expected_status, data=None, timeout=30, auth_required=False):
         """Run a single API test"""
         url = f"{self.base_url}/{endpoint}" if endpoint else self.base_url
-        headers = {'Content-Type': 'application/json'}
-        
-        # Add session token if available and auth required
+
+        # Reuse the shared headers dict; only copy when a token must be added
         if auth_required and self.session_token:
-            headers['Authorization'] = f'Bearer {self.session_token}'
+            headers = {**self._base_headers, 'Authorization': f'Bearer {self.session_token}'}
+        else:
+            headers = self._base_headers
 
         self.tests_run += 1
-        print(f"\n🔍 Testing {name}...")
-        print(f"   URL: {url}")
-        if auth_required:
-            print(f"   Auth: {'✅ Token provided' if self.session_token else '❌ No token'}")
-        
+
+        # Buffer everything and flush with one stdout write per test, so a
+        # test costs one syscall instead of ~10 and concurrent tests don't
+        # interleave their output
+        log = [f"\n🔍 Testing {name}..."]
+        if self.verbose:
+            log.append(f"   URL: {url}")
+            if auth_required:
+                log.append(f"   Auth: {'✅ Token provided' if self.session_token else '❌ No token'}")
+
         try:
             if method == 'GET':
-                response = self.session.get(url, headers=headers, timeout=timeout)
+                response = await self.client.get(url, headers=headers, timeout=timeout)
             elif method == 'POST':
-                response = self.session.post(url, json=data, headers=headers, timeout=timeout)
+                response = await self.client.post(url, json=data, headers=headers, timeout=timeout)
             elif method == 'PUT':
-                response = self.session.put(url, json=data, headers=headers, timeout=timeout)
+                response = await self.client.put(url, json=data, headers=headers, timeout=timeout)
 
-            print(f"   Status Code: {response.status_code}")
-            
             success = response.status_code == expected_status
             if success:
                 self.tests_passed += 1
-                print(f"✅ Passed - Status: {response.status_code}")
+                log.append(f"✅ Passed - Status: {response.status_code}")
                 try:
                     response_data = response.json()
-                    print(f"   Response keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'Non-dict response'}")
+                    if self.verbose:
+                        log.append(f"   Response keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'Non-dict response'}")
                     return True, response_data
                 except:
                     return True, response.text
             else:
-                print(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
+                log.append(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
                 try:
-                    error_data = response.json()
-                    print(f"   Error: {error_data}")
+                    log.append(f"   Error: {response.json()}")
                 except:
-                    print(f"   Error: {response.text}")
+                    log.append(f"   Error: {response.text}")
                 return False, {}
 
-        except requests.exceptions.Timeout:
-            print(f"❌ Failed - Request timed out after {timeout} seconds")
+        except httpx.TimeoutException:
+            log.append(f"❌ Failed - Request timed out after {timeout} seconds")
             return False, {}
         except Exception as e:
-            print(f"❌ Failed - Error: {str(e)}")
+            log.append(f"❌ Failed - Error: {str(e)}")
             return False, {}
+        finally:
+            sys.stdout.write('\n'.join(log) + '\n')
 
-    def test_health_check(self):
+    async def test_health_check(self):
         """Test basic API health check"""
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "API Health Check",
             "GET",
             "",
@@ -76,16 +92,18 @@ class AILearningPlatformTester:
         )
         return success
 
-    def test_signup(self):
+    async def test_signup(self):
         """Test user signup with email and password"""
-        timestamp = datetime.now().strftime('%H%M%S')
+        # uuid4 is one urandom read (no strftime/locale machinery) and can't
+        # collide when signup tests run in the same second under the scheduler
+        suffix = uuid.uuid4().hex[:8]
         test_data = {
-            "email": f"testuser{timestamp}@example.com",
+            "email": f"testuser{suffix}@example.com",
             "password": "testpass123",
             "name": "Test User"
         }
         
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "User Signup",
             "POST",
             "auth/signup",
@@ -111,7 +129,7 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_login(self):
+    async def test_login(self):
         """Test user login with email and password"""
         if not self.user_data:
             print("❌ Cannot test login - no user data from signup")
@@ -122,7 +140,7 @@ class AILearningPlatformTester:
             "password": "testpass123"
         }
         
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "User Login",
             "POST",
             "auth/login",
@@ -147,9 +165,9 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_get_current_user(self):
+    async def test_get_current_user(self):
         """Test getting current user info"""
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Get Current User",
             "GET",
             "auth/me",
@@ -172,9 +190,9 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_dashboard(self):
+    async def test_dashboard(self):
         """Test dashboard data retrieval"""
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Get Dashboard Data",
             "GET",
             "dashboard",
@@ -200,9 +218,9 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_my_courses(self):
+    async def test_my_courses(self):
         """Test getting user's courses"""
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Get My Courses",
             "GET",
             "my-courses",
@@ -222,7 +240,7 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_create_course(self):
+    async def test_create_course(self):
         """Test course creation with JavaScript Fundamentals"""
         test_data = {
             "topic": "JavaScript Fundamentals",
@@ -230,7 +248,7 @@ class AILearningPlatformTester:
             "mode": "Quick"
         }
         
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Create Course - JavaScript Fundamentals",
             "POST",
             "create-course",
@@ -256,8 +274,7 @@ class AILearningPlatformTester:
                 
                 # Validate lesson structure
                 for i, lesson in enumerate(lessons):
-                    required_fields = ['id', 'title', 'content', 'order']
-                    missing_fields = [field for field in required_fields if field not in lesson]
+                    missing_fields = LESSON_REQUIRED_FIELDS - lesson.keys()
                     if missing_fields:
                         print(f"   ⚠️  Lesson {i+1} missing fields: {missing_fields}")
                     else:
@@ -265,8 +282,7 @@ class AILearningPlatformTester:
                 
                 # Validate video structure
                 for i, video in enumerate(videos):
-                    required_fields = ['video_id', 'title', 'channel_name']
-                    missing_fields = [field for field in required_fields if field not in video]
+                    missing_fields = VIDEO_REQUIRED_FIELDS - video.keys()
                     if missing_fields:
                         print(f"   ⚠️  Video {i+1} missing fields: {missing_fields}")
                     else:
@@ -279,13 +295,13 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_get_quiz(self):
+    async def test_get_quiz(self):
         """Test quiz generation for a lesson"""
         if not self.lesson_id:
             print("❌ Cannot test quiz - no lesson ID available")
             return False
         
-        success, response = self.run_test(
+        success, response = await self.run_test(
             f"Get Quiz for Lesson",
             "GET",
             f"quiz/{self.lesson_id}",
@@ -327,7 +343,7 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_save_progress(self):
+    async def test_save_progress(self):
         """Test saving user progress"""
         if not self.lesson_id or not self.course_data:
             print("❌ Cannot test progress - no lesson ID or course data available")
@@ -343,7 +359,7 @@ class AILearningPlatformTester:
             "notes": {self.lesson_id: "Great lesson on JavaScript basics!"}
         }
         
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Save User Progress",
             "POST",
             "progress",
@@ -357,9 +373,9 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_get_progress(self):
+    async def test_get_progress(self):
         """Test retrieving user progress"""
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "Get User Progress",
             "GET",
             "progress",
@@ -380,9 +396,9 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_logout(self):
+    async def test_logout(self):
         """Test user logout"""
-        success, response = self.run_test(
+        success, response = await self.run_test(
             "User Logout",
             "POST",
             "auth/logout",
@@ -397,63 +413,82 @@ class AILearningPlatformTester:
         
         return success
 
-    def test_unauthorized_access(self):
+    async def test_unauthorized_access(self):
         """Test that protected routes require authentication"""
         # Clear session token temporarily
         original_token = self.session_token
         self.session_token = None
         
         print("\n🔍 Testing Unauthorized Access...")
-        
-        # Test dashboard without auth
-        success1, _ = self.run_test(
-            "Dashboard without Auth",
-            "GET",
-            "dashboard",
-            401,
-            auth_required=False
-        )
-        
-        # Test create course without auth
-        success2, _ = self.run_test(
-            "Create Course without Auth",
-            "POST",
-            "create-course",
-            401,
-            data={"topic": "Test", "language": "english", "mode": "Quick"},
-            auth_required=False
-        )
-        
-        # Test my courses without auth
-        success3, _ = self.run_test(
-            "My Courses without Auth",
-            "GET",
-            "my-courses",
-            401,
-            auth_required=False
+
+        # The three probes are independent - fire them concurrently so the
+        # group costs one round trip instead of three
+        results = await asyncio.gather(
+            self.run_test(
+                "Dashboard without Auth",
+                "GET",
+                "dashboard",
+                401,
+                auth_required=False
+            ),
+            self.run_test(
+                "Create Course without Auth",
+                "POST",
+                "create-course",
+                401,
+                data={"topic": "Test", "language": "english", "mode": "Quick"},
+                auth_required=False
+            ),
+            self.run_test(
+                "My Courses without Auth",
+                "GET",
+                "my-courses",
+                401,
+                auth_required=False
+            )
         )
-        
+
         # Restore session token
         self.session_token = original_token
-        
-        return success1 and success2 and success3
 
-    def test_invalid_endpoints(self):
+        return all(success for success, _ in results)
+
+    async def test_invalid_endpoints(self):
         """Test error handling for invalid endpoints"""
         print("\n🔍 Testing Error Handling...")
-        
-        # Test invalid credentials
-        success1, _ = self.run_test(
-            "Invalid Login Credentials",
-            "POST",
-            "auth/login",
-            401,
-            data={"email": "nonexistent@example.com", "password": "wrongpass"}
-        )
-        
-        # Test duplicate signup
+
+        # Independent error probes run concurrently
+        probes = [
+            # Test invalid credentials
+            self.run_test(
+                "Invalid Login Credentials",
+                "POST",
+                "auth/login",
+                401,
+                data={"email": "nonexistent@example.com", "password": "wrongpass"}
+            ),
+            # Test invalid lesson ID for quiz (with auth)
+            self.run_test(
+                "Invalid Lesson ID for Quiz",
+                "GET",
+                "quiz/invalid-lesson-id",
+                404,
+                auth_required=True
+            ),
+            # Test missing required fields in course creation
+            self.run_test(
+                "Missing Topic in Course Creation",
+                "POST",
+                "create-course",
+                422,  # Validation error
+                data={"language": "english", "mode": "Quick"},
+                auth_required=True
+            )
+        ]
+
+        # Test duplicate signup (skipped if signup never ran)
         if self.user_data:
-            success2, _ = self.run_test(
+            probes.append(self.run_test(
                 "Duplicate User Signup",
                 "POST",
                 "auth/signup",
@@ -463,61 +498,63 @@ class AILearningPlatformTester:
                     "password": "testpass123",
                     "name": "Duplicate User"
                 }
-            )
-        else:
-            success2 = True  # Skip if no user data
-        
-        # Test invalid lesson ID for quiz (with auth)
-        success3, _ = self.run_test(
-            "Invalid Lesson ID for Quiz",
-            "GET",
-            "quiz/invalid-lesson-id",
-            404,
-            auth_required=True
-        )
-        
-        # Test missing required fields in course creation
-        success4, _ = self.run_test(
-            "Missing Topic in Course Creation",
-            "POST",
-            "create-course",
-            422,  # Validation error
-            data={"language": "english", "mode": "Quick"},
-            auth_required=True
-        )
-        
-        return success1 and success2 and success3 and success4
+            ))
 
-def main():
+        results = await asyncio.gather(*probes)
+        return all(success for success, _ in results)
+
+async def main():
     print("🚀 Starting AI Learning Platform API Tests with Authentication")
     print("=" * 70)
     
     tester = AILearningPlatformTester()
     
-    # Run all tests in order (authentication first)
+    # Tests form a DAG, not a chain: each entry lists the tests it needs
+    # finished first. Everything whose deps are satisfied runs concurrently,
+    # so wall time is the critical path (signup -> login -> course -> quiz)
+    # rather than the sum of all thirteen tests.
     tests = [
-        ("Basic API", tester.test_health_check),
-        ("Authentication - Signup", tester.test_signup),
-        ("Authentication - Login", tester.test_login),
-        ("Authentication - Get Current User", tester.test_get_current_user),
-        ("Dashboard Data", tester.test_dashboard),
-        ("My Courses", tester.test_my_courses),
-        ("Course Creation", tester.test_create_course),
-        ("Quiz Generation", tester.test_get_quiz),
-        ("Progress Saving", tester.test_save_progress),
-        ("Progress Retrieval", tester.test_get_progress),
-        ("User Logout", tester.test_logout),
-        ("Unauthorized Access", tester.test_unauthorized_access),
-        ("Error Handling", tester.test_invalid_endpoints)
+        ("Basic API", tester.test_health_check, set()),
+        ("Authentication - Signup", tester.test_signup, set()),
+        ("Authentication - Login", tester.test_login, {"Authentication - Signup"}),
+        ("Authentication - Get Current User", tester.test_get_current_user, {"Authentication - Login"}),
+        ("Dashboard Data", tester.test_dashboard, {"Authentication - Login"}),
+        ("My Courses", tester.test_my_courses, {"Authentication - Login"}),
+        ("Course Creation", tester.test_create_course, {"Authentication - Login"}),
+        ("Quiz Generation", tester.test_get_quiz, {"Course Creation"}),
+        ("Progress Saving", tester.test_save_progress, {"Course Creation"}),
+        ("Progress Retrieval", tester.test_get_progress, {"Progress Saving"}),
+        ("Error Handling", tester.test_invalid_endpoints, {"Authentication - Login"}),
+        # Logout kills the shared token, so every authenticated test gates it
+        ("User Logout", tester.test_logout, {
+            "Authentication - Get Current User", "Dashboard Data", "My Courses",
+            "Quiz Generation", "Progress Retrieval", "Error Handling"
+        }),
+        # Toggles the shared token, so it runs once nothing else needs it
+        ("Unauthorized Access", tester.test_unauthorized_access, {"User Logout"})
     ]
-    
-    for test_name, test_func in tests:
+
+    async def run_one(test_name, test_func):
         try:
             print(f"\n{'='*20} {test_name} {'='*20}")
-            test_func()
+            await test_func()
         except Exception as e:
             print(f"❌ Test '{test_name}' failed with exception: {str(e)}")
-    
+
+    pending = {name: (func, set(deps)) for name, func, deps in tests}
+    done = set()
+    while pending:
+        ready = [name for name, (_, deps) in pending.items() if deps <= done]
+        if not ready:
+            print(f"❌ Unsatisfiable test dependencies: {sorted(pending)}")
+            break
+        await asyncio.gather(*(run_one(name, pending[name][0]) for name in ready))
+        for name in ready:
+            done.add(name)
+            del pending[name]
+
+    await tester.client.aclose()
+
     # Print final results
     print("\n" + "=" * 70)
     print(f"📊 FINAL RESULTS")
@@ -534,4 +571,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
\ No newline at end of file